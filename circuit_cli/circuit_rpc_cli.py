@@ -1,12 +1,15 @@
 import argparse
 import asyncio
+import logging
 import os
 import pprint
 
-from chia.types.spend_bundle import SpendBundle
 from clvm_rs.casts import int_from_bytes
 
-from circuit_cli.client import CircuitRPCClient
+from circuit_cli.client import DEFAULT_KEY_COUNT, CircuitRPCClient
+from circuit_cli.utils import positive_int, run, setup_logging
+
+logger = logging.getLogger(__name__)
 
 
 async def get_announcer_name(rpc_client, launcher_id: str = None):
@@ -16,7 +19,7 @@ async def get_announcer_name(rpc_client, launcher_id: str = None):
     for announcer in data:
         if announcer["launcher_id"] == launcher_id:
             return launcher_id, announcer["name"]
-    raise ValueError(f"Announcer with launcher_id {launcher_id.hex()} not found")
+    raise ValueError(f"Announcer with launcher_id {launcher_id} not found")
 
 
 async def announcer_fasttrack(rpc_client, price: int, launcher_id: str = None):
@@ -25,24 +28,24 @@ async def announcer_fasttrack(rpc_client, price: int, launcher_id: str = None):
         print("Launching announcer...")
         resp = await rpc_client.announcer_launch(price=price)
         print("Waiting for time to pass to approve announcer (farm blocks if in simulator)...")
-        bundle = SpendBundle.from_json_dict(resp["bundle"])
         print("Approving announcer...")
-        await rpc_client.wait_for_confirmation(bundle)
+        await rpc_client.wait_for_confirmation(resp["bundle"])
         print("Announcer approved.")
-    launcher_id, coin_name = await get_announcer_name(rpc_client, launcher_id)
-    statutes = await rpc_client.protocol_statutes()
+    (launcher_id, coin_name), statutes = await asyncio.gather(
+        get_announcer_name(rpc_client, launcher_id), rpc_client.statutes_list()
+    )
     # find min deposit amount
     min_deposit = int_from_bytes(bytes.fromhex(statutes["enacted_statutes"]["ANNOUNCER_MINIMUM_DEPOSIT"]))
     max_delay = int_from_bytes(bytes.fromhex(statutes["enacted_statutes"]["ANNOUNCER_PRICE_TTL"]))
     custom_ann_statute = statutes["full_enacted_statutes"]["CUSTOM_ANNOUNCEMENTS"]
     resp = await rpc_client.announcer_configure(coin_name, amount=min_deposit + 1000, delay=max_delay - 10)
-    bundle = SpendBundle.from_json_dict(resp["bundle"])
-    await rpc_client.wait_for_confirmation(bundle)
+    await rpc_client.wait_for_confirmation(resp["bundle"])
     # propose announcer
-    launcher_id, announcer_coin_name = await get_announcer_name(rpc_client, launcher_id)
+    (launcher_id, announcer_coin_name), bills = await asyncio.gather(
+        get_announcer_name(rpc_client, launcher_id), rpc_client.bills_list()
+    )
     vote_data = await rpc_client.announcer_propose(announcer_coin_name, approve=True, no_bundle=True)
     voting_anns = vote_data["announcements_to_vote_for"]
-    bills = await rpc_client.bills_list()
     bill_name = bills[0]["name"]
     resp = await rpc_client.bills_propose(
         bill_name,
@@ -53,13 +56,13 @@ async def announcer_fasttrack(rpc_client, price: int, launcher_id: str = None):
         custom_ann_statute["max_delta"],
         statute_index=-1,
     )
-    bundle = SpendBundle.from_json_dict(resp["bundle"])
-    await rpc_client.wait_for_confirmation(bundle)
-    bills = await rpc_client.bills_list()
-    bill_name = bills[0]["name"]
+    await rpc_client.wait_for_confirmation(resp["bundle"])
     print("Waiting for time to pass to enact bill (farm blocks if in simulator)...")
     await rpc_client.wait_for_confirmation(blocks=3)
-    launcher_id, coin_name = await get_announcer_name(rpc_client, launcher_id)
+    bills, (launcher_id, coin_name) = await asyncio.gather(
+        rpc_client.bills_list(), get_announcer_name(rpc_client, launcher_id)
+    )
+    bill_name = bills[0]["name"]
     resp = await rpc_client.announcer_propose(coin_name, approve=True, enact=True, bill_name=bill_name)
     print("Fasttrack result:")
     return resp
@@ -79,6 +82,18 @@ async def cli():
     parser.add_argument(
         "--private_key", "-p", type=str, default=os.environ.get("PRIVATE_KEY"), help="Private key for your coins"
     )
+    parser.add_argument(
+        "--key-count",
+        type=positive_int,
+        default=DEFAULT_KEY_COUNT,
+        help="Number of synthetic keys to derive from the private key and send to the server",
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default=os.environ.get("LOG_LEVEL", "WARNING"),
+        help="Logging level, e.g. DEBUG to show requests and bundles",
+    )
     upkeep_parser = subparsers.add_parser("upkeep", help="Commands to upkeep protocol and RPC server")
     upkeep_subparsers = upkeep_parser.add_subparsers(dest="action")
     upkeep_subparsers.add_parser("status", help="Get the status of the Circuit RPC server")
@@ -171,33 +186,36 @@ async def cli():
     vault_subparsers.add_parser("show", help="Show the vault")
 
     args = parser.parse_args()
-    rpc_client = CircuitRPCClient(args.base_url, args.private_key, args.add_sig_data, args.fee_per_cost)
-    try:
-        kwargs = dict(vars(args))
-        print(kwargs)
-        del kwargs["command"]
-        del kwargs["action"]
-        del kwargs["base_url"]
-        del kwargs["private_key"]
-        del kwargs["add_sig_data"]
-        del kwargs["fee_per_cost"]
-        if args.command == "announcer" and args.action == "fasttrack":
-            # special case for fasttrack
-            result = await announcer_fasttrack(rpc_client, **kwargs)
-        else:
-            # run commands method dynamically based on the parser command
-            result = await getattr(rpc_client, f"{args.command}_{args.action}")(**kwargs)
-
-        pprint.pprint(result)
-    except (AttributeError, KeyError) as e:
-        print(e)
-        parser.print_help()
-    finally:
-        rpc_client.close()
+    setup_logging(args.log_level)
+    async with CircuitRPCClient(
+        args.base_url, args.private_key, args.add_sig_data, args.fee_per_cost, key_count=args.key_count
+    ) as rpc_client:
+        try:
+            kwargs = dict(vars(args))
+            del kwargs["command"]
+            del kwargs["action"]
+            del kwargs["base_url"]
+            del kwargs["private_key"]
+            del kwargs["add_sig_data"]
+            del kwargs["fee_per_cost"]
+            del kwargs["key_count"]
+            del kwargs["log_level"]
+            logger.debug("Command arguments: %s", kwargs)
+            if args.command == "announcer" and args.action == "fasttrack":
+                # special case for fasttrack
+                result = await announcer_fasttrack(rpc_client, **kwargs)
+            else:
+                # run commands method dynamically based on the parser command
+                result = await getattr(rpc_client, f"{args.command}_{args.action}")(**kwargs)
+
+            pprint.pprint(result)
+        except (AttributeError, KeyError) as e:
+            print(e)
+            parser.print_help()
 
 
 def main():
-    asyncio.run(cli())
+    run(cli())
 
 
 if __name__ == "__main__":
@@ -1,6 +1,9 @@
 import asyncio
+import logging
+from functools import cached_property
 
 import httpx
+import orjson
 from chia.types.spend_bundle import SpendBundle
 from chia.util.bech32m import encode_puzzle_hash
 from chia.wallet.puzzles.p2_delegated_puzzle_or_hidden_puzzle import (
@@ -10,265 +13,309 @@ from chia_rs import PrivateKey
 
 from circuit_cli.utils import generate_ssks, sign_spends
 
+DEFAULT_KEY_COUNT = 500
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+logger = logging.getLogger(__name__)
+
+
+def _raise_for_status(response: httpx.Response):
+    if response.is_error:
+        logger.error("%s %s failed: %s", response.request.method, response.request.url.path, response.text[:2048])
+        response.raise_for_status()
+
 
 class CircuitRPCClient:
     # TODO: add support for fees across all methods
-    def __init__(self, base_url: str, private_key: str, add_sig_data: str = None, fee_per_cost: int = 0):
-        if private_key:
-            secret_key = PrivateKey.from_bytes(bytes.fromhex(private_key))
-            synthetic_secret_keys = generate_ssks(secret_key, 0, 500)
-            synthetic_public_keys = [x.get_g1() for x in synthetic_secret_keys]
-        else:
-            synthetic_secret_keys = []
-            synthetic_public_keys = []
-        self.synthetic_secret_keys = synthetic_secret_keys
-        self.synthetic_public_keys = synthetic_public_keys
-        print([encode_puzzle_hash(puzzle_hash_for_synthetic_public_key(x), "txch") for x in synthetic_public_keys[:5]])
+    def __init__(
+        self,
+        base_url: str,
+        private_key: str,
+        add_sig_data: str = None,
+        fee_per_cost: int = 0,
+        key_count: int = DEFAULT_KEY_COUNT,
+    ):
+        self.secret_key = PrivateKey.from_bytes(bytes.fromhex(private_key)) if private_key else None
+        self.key_count = key_count
         self.base_url = base_url
-        self.client = httpx.Client(base_url=base_url, timeout=120)
-        self.add_sig_data = add_sig_data
+        self.client = httpx.AsyncClient(base_url=base_url, timeout=120, limits=HTTP_LIMITS, http2=True)
+        self.add_sig_data = bytes.fromhex(add_sig_data) if add_sig_data else None
         self.fee_per_cost = fee_per_cost
 
-    async def wait_for_confirmation(self, bundle: SpendBundle = None, blocks=None):
-        if bundle is not None and isinstance(bundle, SpendBundle):
+    @cached_property
+    def synthetic_secret_keys(self):
+        if self.secret_key is None:
+            return []
+        return generate_ssks(self.secret_key, 0, self.key_count)
+
+    @cached_property
+    def synthetic_public_keys(self):
+        synthetic_public_keys = [x.get_g1() for x in self.synthetic_secret_keys]
+        if logger.isEnabledFor(logging.DEBUG):
+            addresses = [
+                encode_puzzle_hash(puzzle_hash_for_synthetic_public_key(x), "txch") for x in synthetic_public_keys[:5]
+            ]
+            logger.debug("First wallet addresses: %s", addresses)
+        return synthetic_public_keys
+
+    @cached_property
+    def synthetic_keys_by_public_key(self):
+        return dict(zip(self.synthetic_public_keys, self.synthetic_secret_keys))
+
+    @cached_property
+    def synthetic_pks_hex(self):
+        return [key.to_bytes().hex() for key in self.synthetic_public_keys]
+
+    @cached_property
+    def puzzle_hash_hex(self):
+        return puzzle_hash_for_synthetic_public_key(self.synthetic_public_keys[0]).hex()
+
+    async def _post(self, path, payload=None):
+        content = orjson.dumps(payload) if payload is not None else None
+        return await self.client.post(path, content=content, headers=JSON_HEADERS if content else None)
+
+    async def _get(self, path):
+        response = await self.client.get(path)
+        _raise_for_status(response)
+        return orjson.loads(response.content)
+
+    async def warm_up(self):
+        """Open the server connection while deriving the synthetic keys in a worker thread."""
+
+        async def connect():
+            try:
+                await self.client.head("/")
+            except httpx.TransportError as e:
+                # a server that's down is reported by the first real request
+                logger.debug("Failed to pre-connect to %s: %s", self.base_url, e)
+
+        await asyncio.gather(connect(), asyncio.to_thread(lambda: self.synthetic_pks_hex))
+
+    async def wait_for_confirmation(self, bundle: SpendBundle | dict = None, blocks=None):
+        if bundle is not None:
+            bundle_dict = bundle.to_json_dict() if isinstance(bundle, SpendBundle) else bundle
+            delay = 1
             while True:
-                response = self.client.post("/transactions/status", json={"bundle": bundle.to_json_dict()})
-                print(response.content)
-                if response.status_code != 200:
-                    response.raise_for_status()
-                data = response.json()
+                response = await self._post("/transactions/status", {"bundle": bundle_dict})
+                _raise_for_status(response)
+                data = orjson.loads(response.content)
+                logger.debug("Transaction status: %s", data)
                 if data["status"] == "confirmed":
                     return True
                 elif data["status"] == "failed":
                     raise ValueError("Transaction failed")
-                await asyncio.sleep(5)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 10)
         elif blocks is not None:
             await asyncio.sleep(blocks * 55)
         else:
             raise ValueError("Either bundle or blocks must be provided")
 
-    async def sign_and_push(self, bundle: SpendBundle):
-        print("USING ADDITIONAL SIGNATURE DATA", self.add_sig_data)
+    async def sign_and_push(self, bundle: SpendBundle | dict):
+        if not isinstance(bundle, SpendBundle):
+            bundle = SpendBundle.from_json_dict(bundle)
+        logger.debug("Using additional signature data %r", self.add_sig_data)
         signed_bundle = await sign_spends(
             bundle.coin_spends,
-            self.synthetic_secret_keys,
+            self.synthetic_keys_by_public_key,
             add_data=self.add_sig_data,
         )
 
         assert isinstance(signed_bundle, SpendBundle)
-        response = self.client.post(
+        response = await self._post(
             "/sign_and_push",
-            json={
+            {
                 "bundle_dict": signed_bundle.to_json_dict(),
                 "signature": signed_bundle.aggregated_signature.to_bytes().hex(),
             },
         )
-        json_resp = response.json()
-        print("Got response from sign and push", response.status_code, json_resp)
-        if response.status_code != 200:
-            print("Error from sign and push:", response.content)
-            response.raise_for_status()
-        print("Returning signed bundle")
+        _raise_for_status(response)
+        json_resp = orjson.loads(response.content)
+        logger.debug("Got response from sign and push: %s", json_resp)
         return json_resp
 
+    async def sign_and_push_many(self, bundles: list[SpendBundle | dict], concurrency: int = 16):
+        """
+        Sign and push bundles concurrently. The bundles must not spend the same coins.
+
+        A failed push does not stop the others: its exception is returned in place of its result.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def sign_and_push(bundle):
+            async with semaphore:
+                return await self.sign_and_push(bundle)
+
+        return await asyncio.gather(*(sign_and_push(bundle) for bundle in bundles), return_exceptions=True)
+
+    async def _post_sign_push(self, path, payload):
+        response = await self._post(path, payload)
+        _raise_for_status(response)
+        bundle = orjson.loads(response.content)
+        logger.debug("Got bundle from %s, signing and pushing: %s", path, bundle)
+        return await self.sign_and_push(bundle)
+
+    def _payload(self, **fields):
+        return {"synthetic_pks": self.synthetic_pks_hex, "fee_per_cost": self.fee_per_cost, **fields}
+
+    async def _sign_push_and_wait(self, bundle: dict):
+        sig_response = await self.sign_and_push(bundle)
+        await self.wait_for_confirmation(sig_response["bundle"])
+        return sig_response
+
     async def wallet_balances(self):
-        response = self.client.post(
-            "/balances", json={"synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys]}
-        )
-        return response.json()
+        response = await self._post("/balances", {"synthetic_pks": self.synthetic_pks_hex})
+        return orjson.loads(response.content)
 
     async def wallet_coins(self):
-        response = self.client.post(
-            "/coins", json={"synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys]}
-        )
-        return response.json()
-
-    async def vault_deposit(self, args):
-        response = self.client.post(
-            "/vault/deposit",
-            json={
-                "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
-                "amount": args.amount,
-                "fee_per_cost": self.fee_per_cost,
-            },
-        )
-        bundle: SpendBundle = SpendBundle.from_json_dict(response.json()["bundle"])
-        sig_response = await self.sign_and_push(bundle)
-        return sig_response.json()
-
-    async def vault_borrow(self, args):
-        response = self.client.post(
-            "/vault/borrow",
-            json={
-                "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
-                "amount": args.amount,
-                "fee_per_cost": self.fee_per_cost,
-            },
-        )
-        bundle: SpendBundle = SpendBundle.from_json_dict(response.json()["bundle"])
-        sig_response = await self.sign_and_push(bundle)
-        return sig_response.json()
+        response = await self._post("/coins", {"synthetic_pks": self.synthetic_pks_hex})
+        return orjson.loads(response.content)
+
+    async def vault_deposit(self, amount):
+        response = await self._post("/vault/deposit", self._payload(amount=amount))
+        _raise_for_status(response)
+        return await self.sign_and_push(orjson.loads(response.content)["bundle"])
 
-    async def protocol_statutes(self):
-        response = self.client.get("/statutes")
-        return response.json()
+    async def vault_borrow(self, amount):
+        response = await self._post("/vault/borrow", self._payload(amount=amount))
+        _raise_for_status(response)
+        return await self.sign_and_push(orjson.loads(response.content)["bundle"])
 
-    async def vault_show(self, args):
-        response = self.client.post(
+    async def vault_show(self):
+        response = await self._post(
             "/vault",
-            json={
-                "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
+            {
+                "synthetic_pks": self.synthetic_pks_hex,
             },
         )
-        return response.json()
+        return orjson.loads(response.content)
 
     async def announcer_launch(self, price):
-        response = self.client.post(
+        response = await self._post(
             "/announcers/launch",
-            json={
-                "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
-                "operation": "launch",
-                "args": {"price": price},
-                "fee_per_cost": self.fee_per_cost,
-            },
+            self._payload(
+                operation="launch",
+                args={"price": price},
+            ),
         )
-        bundle_json = response.json()
-        bundle: SpendBundle = SpendBundle.from_json_dict(bundle_json)
-        sig_response = await self.sign_and_push(bundle)
-        signed_bundle = SpendBundle.from_json_dict(sig_response["bundle"])
-        await self.wait_for_confirmation(signed_bundle)
-        return sig_response
+        return await self._sign_push_and_wait(orjson.loads(response.content))
 
     async def announcer_configure(self, coin_name, amount=None, inner_puzzle_hash=None, delay=None, deactivate=None):
-        if not coin_name:
-            response = self.client.post(
-                "/announcers/",
-                json={
-                    "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
-                },
-            )
-            data = response.json()
-            coin_name = data[0]["name"]
-        else:
-            coin_name = coin_name
-
-        response = self.client.post(
+        coin_name = coin_name or await self._announcer_name()
+        return await self._post_sign_push(
             "/announcers/" + coin_name,
-            json={
-                "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
-                "operation": "configure",
-                "args": {
+            self._payload(
+                operation="configure",
+                args={
                     "new_amount": amount,
                     "new_inner_puzzle_hash": inner_puzzle_hash,
                     "new_delay": delay,
                     "deactivate": deactivate,
                 },
-                "fee_per_cost": self.fee_per_cost,
-            },
+            ),
         )
-        data = response.json()
-        print("Got bundle, signing and pushing", data)
-        bundle: SpendBundle = SpendBundle.from_json_dict(data)
-        sig_response = await self.sign_and_push(bundle)
-        return sig_response
 
     async def announcer_mutate(self, coin_name, price):
-        if not coin_name:
-            response = self.client.post(
-                "/announcers/",
-                json={
-                    "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
-                },
-            )
-            data = response.json()
-            coin_name = data[0]["name"]
-        else:
-            coin_name = coin_name
-
-        response = self.client.post(
+        coin_name = coin_name or await self._announcer_name()
+        return await self._post_sign_push(
             "/announcers/" + coin_name,
-            json={
-                "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
-                "operation": "mutate",
-                "args": {
+            self._payload(
+                operation="mutate",
+                args={
                     "new_price": price,
                 },
-                "fee_per_cost": self.fee_per_cost,
-            },
+            ),
         )
-        bundle: SpendBundle = SpendBundle.from_json_dict(response.json())
-        sig_response = await self.sign_and_push(bundle)
-        return sig_response
+
+    async def _announcer_name(self):
+        # not cached, the announcer coin changes with every operation on it
+        announcers = await self.announcer_list()
+        return announcers[0]["name"]
+
+    async def protocol_state(self):
+        return await self._get("/protocol/state")
 
     async def upkeep_sync(self):
-        response = self.client.post("/sync_chain_data")
-        return response.json()
+        response = await self._post("/sync_chain_data")
+        return orjson.loads(response.content)
 
     async def upkeep_vaults(self):
-        response = self.client.get("/vaults")
-        return response.json()
+        return await self._get("/vaults")
+
+    async def _upkeep_bundle(self, path, **fields):
+        response = await self._post(path, {"synthetic_pks": self.synthetic_pks_hex, **fields})
+        _raise_for_status(response)
+        return orjson.loads(response.content)
+
+    async def upkeep_start_auction(self, vault_name):
+        """Return the unsigned bundle that starts an auction for a vault pending liquidation."""
+        return await self._upkeep_bundle(
+            "/vaults/start_auction", vault_name=vault_name, initiator_puzzle_hash=self.puzzle_hash_hex
+        )
+
+    async def upkeep_vault(self, vault_name):
+        return await self._get("/vaults/" + vault_name)
+
+    async def upkeep_bid_auction(self, vault_name, amount, max_bid_price):
+        """Return the unsigned bundle that bids amount BYC in the auction of a vault in liquidation."""
+        return await self._upkeep_bundle(
+            "/vaults/bid_auction",
+            vault_name=vault_name,
+            bidder_puzzle_hash=self.puzzle_hash_hex,
+            max_bid_price=max_bid_price,
+            amount=amount,
+        )
+
+    async def upkeep_recover_bad_debt(self, vault_name):
+        """Return the unsigned bundle that recovers bad debt from a vault."""
+        return await self._upkeep_bundle("/vaults/recover_bad_debt", vault_name=vault_name)
 
     async def upkeep_transfer_sf(self, vault_id):
-        response = self.client.post(
+        response = await self._post(
             "/vaults/transfer_stability_fees",
-            json={
-                "vault_name": vault_id,
-                "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
-                "fee_per_cost": self.fee_per_cost,
-            },
-            headers={"Content-Type": "application/json"},
+            self._payload(vault_name=vault_id),
         )
-        if response.is_error:
-            print(response.content)
-            response.raise_for_status()
-        bundle = response.json()
+        _raise_for_status(response)
+        bundle = orjson.loads(response.content)
         if bundle.get("detail"):
             return bundle
-        print("Got bundle, signing and pushing", bundle)
-        signed_bundle_json = await self.sign_and_push(SpendBundle.from_json_dict(bundle))
-        await self.wait_for_confirmation(SpendBundle.from_json_dict(signed_bundle_json["bundle"]))
+        logger.debug("Got bundle, signing and pushing: %s", bundle)
+        await self._sign_push_and_wait(bundle)
         return {"status": "confirmed"}
 
     async def announcer_list(self, **args):
-        response = self.client.post(
+        response = await self._post(
             "/announcers/",
-            json={
-                "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
+            {
+                "synthetic_pks": self.synthetic_pks_hex,
             },
         )
-        return response.json()
+        return orjson.loads(response.content)
 
     async def bills_list(self, list_all=False):
         if list_all:
-            response = self.client.post(
+            response = await self._post(
                 "/bills",
-                json={"synthetic_pks": []},
+                {"synthetic_pks": []},
             )
-            return response.json()
-        pks = [key.to_bytes().hex() for key in self.synthetic_public_keys]
-        response = self.client.post(
+            return orjson.loads(response.content)
+        response = await self._post(
             "/bills",
-            json={"synthetic_pks": pks},
-            headers={"Content-Type": "application/json"},
+            {"synthetic_pks": self.synthetic_pks_hex},
         )
-        return response.json()
+        return orjson.loads(response.content)
 
     async def bills_toggle(self, coin_name: str, set_governance: bool = False):
-        print("Fee per cost", self.fee_per_cost)
         if set_governance is None:
             set_governance = False
-        response = self.client.post(
+        return await self._post_sign_push(
             "/coins/set_governance",
-            json={
-                "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
-                "coin_name": coin_name,
-                "set_governance": set_governance,
-                "fee_per_cost": self.fee_per_cost,
-            },
+            self._payload(
+                coin_name=coin_name,
+                set_governance=set_governance,
+            ),
         )
-        bundle = response.json()
-        print("Got bundle, signing and pushing", bundle)
-        return await self.sign_and_push(SpendBundle.from_json_dict(bundle))
 
     async def bills_propose(
         self,
@@ -280,138 +327,100 @@ class CircuitRPCClient:
         max_delta,
         statute_index,
     ):
-        response = self.client.post(
+        return await self._post_sign_push(
             "/bills/new",
-            json={
-                "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
-                "coin_name": coin_name,
-                "value": value,
-                "threshold_amount_to_propose": threshold_amount_to_propose,
-                "veto_seconds": veto_seconds,
-                "delay_seconds": delay_seconds,
-                "max_delta": max_delta,
-                "statute_index": statute_index,
-                "fee_per_cost": self.fee_per_cost,
-            },
+            self._payload(
+                coin_name=coin_name,
+                value=value,
+                threshold_amount_to_propose=threshold_amount_to_propose,
+                veto_seconds=veto_seconds,
+                delay_seconds=delay_seconds,
+                max_delta=max_delta,
+                statute_index=statute_index,
+            ),
         )
-        print("Got bundle, posting new bill")
-        bundle = response.json()
-        if response.status_code != 200:
-            print(response.content)
-            response.raise_for_status()
-        sig_response = await self.sign_and_push(SpendBundle.from_json_dict(bundle))
-        return sig_response
 
     async def oracle_update(self):
-        response = self.client.post(
+        response = await self._post(
             "/oracle/",
-            json={
-                "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
-                "fee_per_cost": self.fee_per_cost,
-            },
+            self._payload(),
         )
-        data = response.json()
-        try:
-            bundle = SpendBundle.from_json_dict(data)
-            return await self.sign_and_push(bundle)
-        except:
-            print("Failed to update oracle", data)
-            raise ValueError("Failed to update oracle")
+        data = orjson.loads(response.content)
+        if not isinstance(data, dict) or "coin_spends" not in data:
+            raise ValueError("Failed to update oracle: %s" % data)
+        return await self.sign_and_push(data)
 
     async def statutes_list(self):
-        response = self.client.get(
-            "/statutes",
-        )
-        data = response.json()
-        return data
+        return await self._get("/statutes")
 
     async def statutes_update_price(self, *args):
-        response = self.client.post(
+        response = await self._post(
             "/statutes/price/",
-            json={
-                "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
-                "fee_per_cost": self.fee_per_cost,
-            },
+            self._payload(),
         )
         try:
-            data = response.json()
-        except:
-            error = response.content
-            raise ValueError("Failed to parse response: %s" % error)
-        try:
-            bundle = SpendBundle.from_json_dict(data)
-            return await self.sign_and_push(bundle)
-        except:
-            print("Failed to update statutes", data)
-            raise ValueError("Failed to update statutes")
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            raise ValueError("Failed to parse response: %s" % response.text)
+        if not isinstance(data, dict) or "coin_spends" not in data:
+            raise ValueError("Failed to update statutes: %s" % data)
+        return await self.sign_and_push(data)
 
     async def statutes_announce(self, *args):
-        response = self.client.post(
+        response = await self._post(
             "/statutes",
-            json={
-                "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
-                "fee_per_cost": self.fee_per_cost,
-            },
+            self._payload(),
         )
         try:
-            data = response.json()
-        except:
-            error = response.content
-            raise ValueError("Failed to parse response: %s" % error)
-        try:
-            bundle = SpendBundle.from_json_dict(data["bundle"])
-            print("Announcing statutes", bundle)
-            return await self.sign_and_push(bundle)
-        except:
-            print("Failed to announce statutes", data)
-            raise ValueError("Failed to announce statutes")
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            raise ValueError("Failed to parse response: %s" % response.text)
+        bundle = data.get("bundle") if isinstance(data, dict) else None
+        if not (isinstance(bundle, dict) and "coin_spends" in bundle):
+            raise ValueError("Failed to announce statutes: %s" % data)
+        logger.debug("Announcing statutes: %s", bundle)
+        return await self.sign_and_push(bundle)
 
     async def announcer_propose(self, coin_name, approve, bill_name=None, no_bundle=True, enact=False):
         announcer_name = coin_name
-        print("Enacting bill", enact, bill_name)
+        logger.debug("Proposing announcer %s, enact=%s, bill=%s", announcer_name, enact, bill_name)
         if enact:
             bill_coin_name = bill_name
-            bill_response = self.client.post(
+            bill_response = await self._post(
                 "/bills/enact",
-                json={
-                    "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
-                    "coin_name": bill_coin_name,
-                    "fee_per_cost": self.fee_per_cost,
-                },
+                self._payload(coin_name=bill_coin_name),
             )
-            print("Got bill, proposing announcer", bill_response.content)
-            bundle_dict = bill_response.json()
-            enact_bundle = SpendBundle.from_json_dict(bundle_dict)
-            response = self.client.post(
+            logger.debug("Got bill, proposing announcer: %s", bill_response.content)
+            bundle_dict = orjson.loads(bill_response.content)
+            response = await self._post(
                 "/announcers/%s" % announcer_name,
-                json={
-                    "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
-                    "operation": "govern",
-                    "args": {
+                self._payload(
+                    operation="govern",
+                    args={
                         "toggle_activation": approve,
-                        "enact_bundle": enact_bundle.to_json_dict(),
+                        "enact_bundle": bundle_dict,
                     },
-                    "fee_per_cost": self.fee_per_cost,
-                },
+                ),
             )
-            propose_result = response.json()
-            print("Got bundle, signing and pushing", propose_result)
-            unsigned_bundle = SpendBundle.from_json_dict(propose_result["bundle"])
-            resp_data = await self.sign_and_push(unsigned_bundle)
-            return resp_data
+            propose_result = orjson.loads(response.content)
+            logger.debug("Got bundle, signing and pushing: %s", propose_result)
+            return await self.sign_and_push(propose_result["bundle"])
         else:
-            print("Proposing announcer", announcer_name)
-            response = self.client.post(
+            response = await self._post(
                 "/announcers/%s" % announcer_name,
-                json={
-                    "synthetic_pks": [key.to_bytes().hex() for key in self.synthetic_public_keys],
-                    "operation": "govern",
-                    "args": {"toggle_activation": approve, "no_bundle": no_bundle},
-                    "fee_per_cost": self.fee_per_cost,
-                },
+                self._payload(
+                    operation="govern",
+                    args={"toggle_activation": approve, "no_bundle": no_bundle},
+                ),
             )
-            bundle = response.json()
+            bundle = orjson.loads(response.content)
             return bundle
 
-    def close(self):
-        self.client.close()
+    async def close(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
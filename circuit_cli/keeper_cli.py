@@ -1,12 +1,13 @@
 import argparse
 import asyncio
 import os
+from decimal import Decimal
 
 import httpx
-from chia.types.spend_bundle import SpendBundle
-from chia.wallet.puzzles.p2_delegated_puzzle_or_hidden_puzzle import puzzle_hash_for_synthetic_public_key
+import orjson
 
-from circuit_cli.client import CircuitRPCClient
+from circuit_cli.client import DEFAULT_KEY_COUNT, CircuitRPCClient
+from circuit_cli.utils import positive_int, run, setup_logging
 
 MOJOS = 10**12
 
@@ -15,7 +16,7 @@ async def fetch_okx_price():
     """
     Fetches the latest price of a cryptocurrency from OKX API v5.
 
-    :return: The latest price as a float, or None if an error occurs.
+    :return: The latest price in cents, or None if an error occurs.
     """
     url = "https://www.okx.com/api/v5/market/ticker?instId=XCH-USDT"
     headers = {"Accept": "application/json"}
@@ -25,12 +26,41 @@ async def fetch_okx_price():
             okx_response = await http_client.get(url, headers=headers)
             okx_response.raise_for_status()  # Raises an error for bad responses
             okx_data = okx_response.json()
-            return int(float(okx_data["data"][0]["last"]) * 100)
+            return int(Decimal(okx_data["data"][0]["last"]) * 100)
         except Exception as e:
             print(f"Error fetching crypto price: {e}")
             return None
 
 
+RPC_ERRORS = (httpx.HTTPError, orjson.JSONDecodeError)
+
+
+def split_results(names, results):
+    succeeded, failed = {}, {}
+    for name, result in zip(names, results):
+        if isinstance(result, RPC_ERRORS):
+            failed[name] = result
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            succeeded[name] = result
+    return succeeded, failed
+
+
+async def push_for_vaults(rpc_client, request_bundle, vaults):
+    """
+    Request a bundle for every vault, then sign and push the ones that came back.
+
+    :return: The push results and the errors, both keyed by vault name. Every vault was pushed if there are no errors.
+    """
+    names = [vault["name"] for vault in vaults]
+    results = await asyncio.gather(*(request_bundle(name) for name in names), return_exceptions=True)
+    bundles, failed = split_results(names, results)
+    results = await rpc_client.sign_and_push_many(list(bundles.values()))
+    pushed, push_failed = split_results(list(bundles), results)
+    return pushed, failed | push_failed
+
+
 async def run_keeper():
     # TODO: simple bot liquidation strategy, bid % diff between current price and the price in the vault bid
     #       - start auction when it finds a pending vault for liquidation (vault with debt > 0)
@@ -45,58 +75,63 @@ async def run_keeper():
     parser.add_argument(
         "--private_key", "-p", type=str, default=os.environ.get("PRIVATE_KEY"), help="Private key for your coins"
     )
+    parser.add_argument(
+        "--key-count",
+        type=positive_int,
+        default=DEFAULT_KEY_COUNT,
+        help="Number of synthetic keys to derive from the private key and send to the server",
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default=os.environ.get("LOG_LEVEL", "WARNING"),
+        help="Logging level, e.g. DEBUG to show requests and bundles",
+    )
     parser.add_argument("--max-bid-amount", type=int, required=True, help="Max amount bot should bid in BYC")
     parser.add_argument(
         "--min-discount", type=float, required=True, help="Min discount between market XCH price and bid price to bid"
     )
     args = parser.parse_args()
-    rpc_client = CircuitRPCClient(args.base_url, args.private_key)
+    setup_logging(args.log_level)
+    rpc_client = CircuitRPCClient(args.base_url, args.private_key, key_count=args.key_count)
+    await rpc_client.warm_up()
     while True:
         # any vaults to liquidate?
-        response = rpc_client.client.get("/protocol/state")
-        if response.status_code != 200:
-            print("Failed to get protocol state", response.content)
+        state, balances = await asyncio.gather(
+            rpc_client.protocol_state(), rpc_client.wallet_balances(), return_exceptions=True
+        )
+        errors = [result for result in (state, balances) if isinstance(result, BaseException)]
+        for error in errors:
+            if not isinstance(error, RPC_ERRORS):
+                raise error
+        if errors:
+            print("Failed to get protocol state", errors)
             await asyncio.sleep(60)
             continue
-        state = response.json()
-        my_puzzle_hash = puzzle_hash_for_synthetic_public_key(rpc_client.synthetic_public_keys[0])
-        balances = await rpc_client.wallet_balances()
         print("Balances", balances)
         print("State", state)
         if state["vaults_pending_liquidation"]:
             print("Found vaults pending liquidation", state["vaults_pending_liquidation"])
             vaults_pending = state["vaults_pending_liquidation"]
-            for vault_pending in vaults_pending:
-                vault_pending_name = vault_pending["name"]
-                response = rpc_client.client.post(
-                    "/vaults/start_auction",
-                    json={
-                        "vault_name": vault_pending_name,
-                        "synthetic_pks": [key.to_bytes().hex() for key in rpc_client.synthetic_public_keys],
-                        "initiator_puzzle_hash": my_puzzle_hash.hex(),
-                    },
-                )
-                if response.status_code != 200:
-                    print("Failed to start auction", response.content)
-                    await asyncio.sleep(60)
-                    continue
-                auction_bundle = response.json()
-                # sign
-                signed_data = await rpc_client.sign_and_push(SpendBundle.from_json_dict(auction_bundle))
-                print("Auction started", signed_data)
+            # auctions for different vaults are independent, start them all at once
+            pushed, failed = await push_for_vaults(rpc_client, rpc_client.upkeep_start_auction, vaults_pending)
+            for vault_name, signed_data in pushed.items():
+                print("Auction started", vault_name, signed_data)
+            for vault_name, error in failed.items():
+                print("Failed to start auction", vault_name, error)
+            if failed:
+                await asyncio.sleep(60)
         elif state["vaults_in_liquidation"]:
             print("Found vaults in liquidation", state["vaults_in_liquidation"])
             vaults_in_liquidation = state["vaults_in_liquidation"]
             for vault_in_liquidation in vaults_in_liquidation:
                 vault_name = vault_in_liquidation["name"]
                 # get vault info first
-                response = rpc_client.client.get(
-                    "/vaults/" + vault_in_liquidation["name"],
-                )
-                if response.status_code != 200:
-                    print("Failed to get vault info", response.content)
+                try:
+                    vault_info = await rpc_client.upkeep_vault(vault_name)
+                except RPC_ERRORS as e:
+                    print("Failed to get vault info", e)
                     continue
-                vault_info = response.json()
                 bid_price_per_xch = vault_info["price_per_collateral"]
                 print("Vault info", vault_info)
                 assert bid_price_per_xch
@@ -129,61 +164,41 @@ async def run_keeper():
                     continue
                 # bid
                 print(f"Calculating xch to acquire with params: {args.max_bid_amount}, {bid_price_per_xch}")
-                xch_to_acquire = (args.max_bid_amount / 1000) / (bid_price_per_xch / 100) * MOJOS
+                # integer math, mojo amounts this large lose precision as floats
+                xch_to_acquire = args.max_bid_amount * 100 * MOJOS // (1000 * bid_price_per_xch)
                 print(f"XCH to acquire: {xch_to_acquire} vs available: {available_xch}")
                 if xch_to_acquire > available_xch:
-                    byc_bid_amount = int((available_xch / MOJOS) * bid_price_per_xch) * 100
+                    byc_bid_amount = available_xch * bid_price_per_xch // MOJOS * 100
                     xch_to_acquire = available_xch
                     print(f"Not enough XCH to bid ({available_xch}), lowering bid amount", byc_bid_amount)
                 else:
                     byc_bid_amount = args.max_bid_amount
                     print("Enough XCH to bid, bidding full amount", byc_bid_amount)
                 print(f"Bidding {byc_bid_amount} BYC for {xch_to_acquire / MOJOS} XCH")
-                response = rpc_client.client.post(
-                    "/vaults/bid_auction",
-                    json={
-                        "vault_name": vault_name,
-                        "synthetic_pks": [key.to_bytes().hex() for key in rpc_client.synthetic_public_keys],
-                        "bidder_puzzle_hash": my_puzzle_hash.hex(),
-                        "max_bid_price": bid_price_per_xch + 1,
-                        "amount": byc_bid_amount,
-                    },
-                )
-                if response.status_code != 200:
-                    print("Failed to bid auction", response.content)
+                try:
+                    bid_bundle = await rpc_client.upkeep_bid_auction(vault_name, byc_bid_amount, bid_price_per_xch + 1)
+                except RPC_ERRORS as e:
+                    print("Failed to bid auction", e)
                     continue
-                bid_bundle = response.json()
                 # sign
-                await rpc_client.sign_and_push(SpendBundle.from_json_dict(bid_bundle))
+                await rpc_client.sign_and_push(bid_bundle)
                 print("Bid placed, acquired more xch", vaults_in_liquidation)
         elif state["vaults_with_bad_debt"]:
             print("Found vaults with bad debt", state["vaults_with_bad_debt"])
             vaults_with_bad_debt = state["vaults_with_bad_debt"]
-            for vault_with_bad_debt in vaults_with_bad_debt:
-                vault_name = vault_with_bad_debt["name"]
-                response = rpc_client.client.post(
-                    "/vaults/recover_bad_debt",
-                    json={
-                        "vault_name": vault_name,
-                        "synthetic_pks": [key.to_bytes().hex() for key in rpc_client.synthetic_public_keys],
-                    },
-                )
-                if response.status_code != 200:
-                    print("Failed to liquidate vault", response.content)
-                    await asyncio.sleep(60)
-                    continue
-                liquidation_bundle = response.json()
-                # sign
-                signed_data = await rpc_client.sign_and_push(SpendBundle.from_json_dict(liquidation_bundle))
-                print("Recovered some debt", signed_data)
+            pushed, failed = await push_for_vaults(rpc_client, rpc_client.upkeep_recover_bad_debt, vaults_with_bad_debt)
+            for vault_name, signed_data in pushed.items():
+                print("Recovered some debt", vault_name, signed_data)
+            for vault_name, error in failed.items():
+                print("Failed to liquidate vault", vault_name, error)
+            if failed:
+                await asyncio.sleep(60)
         print("Waiting for next upkeep...")
         await asyncio.sleep(30)
 
 
 def main():
-    import asyncio
-
-    asyncio.run(run_keeper())
+    run(run_keeper())
 
 
 if __name__ == "__main__":
@@ -3,18 +3,20 @@ import asyncio
 import os
 import time
 import traceback
+from decimal import Decimal
 
 import httpx
 from chia.types.spend_bundle import SpendBundle
 
-from circuit_cli.client import CircuitRPCClient
+from circuit_cli.client import DEFAULT_KEY_COUNT, CircuitRPCClient
+from circuit_cli.utils import positive_int, run, setup_logging
 
 
 async def fetch_okx_price():
     """
     Fetches the latest price of a cryptocurrency from OKX API v5.
 
-    :return: The latest price as a float, or None if an error occurs.
+    :return: The latest price in cents, or None if an error occurs.
     """
     url = "https://www.okx.com/api/v5/market/ticker?instId=XCH-USDT"
     headers = {"Accept": "application/json"}
@@ -24,7 +26,7 @@ async def fetch_okx_price():
             okx_response = await http_client.get(url, headers=headers)
             okx_response.raise_for_status()  # Raises an error for bad responses
             okx_data = okx_response.json()
-            return int(float(okx_data["data"][0]["last"]) * 100)
+            return int(Decimal(okx_data["data"][0]["last"]) * 100)
         except Exception as e:
             print(f"Error fetching crypto price: {e}")
             return None
@@ -36,7 +38,9 @@ async def fetch_gateio_price():
         gateio_response = await client.get(url)
         if gateio_response.status_code == 200:
             gateio_data = gateio_response.json()
-            return int(float(gateio_data.get("last")) * 100)
+            if gateio_data.get("last") is None:
+                raise ValueError(f"No price in gate.io response: {gateio_response.text}")
+            return int(Decimal(str(gateio_data["last"])) * 100)
         else:
             raise ValueError(f"Failed to fetch price from gate.io: {gateio_response.text}")
 
@@ -53,10 +57,26 @@ async def run_announcer():
     parser.add_argument(
         "--private_key", "-p", type=str, default=os.environ.get("PRIVATE_KEY"), help="Private key for your coins"
     )
+    parser.add_argument(
+        "--key-count",
+        type=positive_int,
+        default=DEFAULT_KEY_COUNT,
+        help="Number of synthetic keys to derive from the private key and send to the server",
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default=os.environ.get("LOG_LEVEL", "WARNING"),
+        help="Logging level, e.g. DEBUG to show requests and bundles",
+    )
     parser.add_argument("--fee-per-cost", "-fpc", type=str, help="Add transaction fee, set as fee per cost.")
     parser.add_argument("--launcher_id", "-l", type=str, required=True, help="Announcer launcher id")
     args = parser.parse_args()
-    rpc_client = CircuitRPCClient(args.base_url, args.private_key, args.add_sig_data, args.fee_per_cost)
+    setup_logging(args.log_level)
+    rpc_client = CircuitRPCClient(
+        args.base_url, args.private_key, args.add_sig_data, args.fee_per_cost, key_count=args.key_count
+    )
+    await rpc_client.warm_up()
 
     while True:
         coin_name = args.launcher_id
@@ -112,36 +132,33 @@ async def run_announcer():
             await rpc_client.upkeep_sync()
             print("Updating oracle")
             data = await rpc_client.oracle_update()
-        except (ValueError, httpx.TransportError) as ve:
+        except (ValueError, httpx.HTTPError) as ve:
             print("Error updating oracle", ve)
         # first we announce so we can update statutes after
         try:
             data = await rpc_client.statutes_announce()
             print("Announce statutes", data)
-            bundle = SpendBundle.from_json_dict(data["bundle"])
-            await rpc_client.wait_for_confirmation(bundle)
-        except (ValueError, httpx.TransportError):
+            await rpc_client.wait_for_confirmation(data["bundle"])
+        except (ValueError, httpx.HTTPError):
             print("Failed to announce statutes")
         # update statutes price if oracle update was successful
         try:
             data = await rpc_client.statutes_update_price()
             print("Statutes updated, waiting for confirmation")
             try:
-                await rpc_client.wait_for_confirmation(SpendBundle.from_json_dict(data["bundle"]))
+                await rpc_client.wait_for_confirmation(data["bundle"])
                 print("Statutes price updated!")
-            except (ValueError, httpx.TransportError) as ve:
+            except (ValueError, httpx.HTTPError) as ve:
                 print("Failed to confirm statutes update", ve)
                 continue
-        except (ValueError, httpx.TransportError) as ve:
+        except (ValueError, httpx.HTTPError) as ve:
             print("Failed to update statutes price", ve)
             traceback.print_exc()
         await asyncio.sleep(50)
 
 
 def main():
-    import asyncio
-
-    asyncio.run(run_announcer())
+    run(run_announcer())
 
 
 if __name__ == "__main__":
@@ -1,6 +1,11 @@
-import inspect
+import argparse
+import asyncio
+import atexit
+import logging
+import queue
 from copy import copy
-from typing import Any, Callable, List
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Coroutine, Dict, List
 
 from chia.consensus.default_constants import DEFAULT_CONSTANTS
 from chia.types.blockchain_format.sized_bytes import bytes32
@@ -15,10 +20,10 @@ from chia_rs import AugSchemeMPL, G1Element, G2Element
 from chia_rs import PrivateKey
 
 
-async def sign_coin_spends(
+def sign_coin_spends(
     coin_spends: List[CoinSpend],
-    secret_key_for_public_key_f: Any,  # Potentially awaitable function from G1Element => Optional[PrivateKey]
-    secret_key_for_puzzle_hash: Any,  # Potentially awaitable function from bytes32 => Optional[PrivateKey]
+    secret_key_for_public_key_f: Any,  # Function from G1Element => Optional[PrivateKey]
+    secret_key_for_puzzle_hash: Any,  # Function from bytes32 => Optional[PrivateKey]
     additional_data: bytes,
     max_cost: int,
     potential_derivation_functions: List[Callable[[G1Element], bytes32]],
@@ -51,16 +56,10 @@ async def sign_coin_spends(
             pk = G1Element.from_bytes(bytes(pk_bytes))
             pk_list.append(pk)
             msg_list.append(msg)
-            if inspect.iscoroutinefunction(secret_key_for_public_key_f):
-                secret_key = await secret_key_for_public_key_f(pk)
-            else:
-                secret_key = secret_key_for_public_key_f(pk)
+            secret_key = secret_key_for_public_key_f(pk)
             if secret_key is None or secret_key.get_g1() != pk:
                 for derive in potential_derivation_functions:
-                    if inspect.iscoroutinefunction(secret_key_for_puzzle_hash):
-                        secret_key = await secret_key_for_puzzle_hash(derive(pk))
-                    else:
-                        secret_key = secret_key_for_puzzle_hash(derive(pk))
+                    secret_key = secret_key_for_puzzle_hash(derive(pk))
                     if secret_key is not None and secret_key.get_g1() == pk:
                         break
                 else:
@@ -73,21 +72,16 @@ async def sign_coin_spends(
     return SpendBundle(coin_spends, aggsig)
 
 
-async def sign_spends(coin_spends: List[CoinSpend], private_keys: List[PrivateKey], add_data=None) -> SpendBundle:
-    def public_key_to_private_key(pk):
-        for sk in private_keys:
-            if pk == sk.get_g1():
-                return sk
-        return None
-
+async def sign_spends(
+    coin_spends: List[CoinSpend], private_keys: Dict[G1Element, PrivateKey], add_data: bytes = None
+) -> SpendBundle:
     if add_data is None:
         add_data = DEFAULT_CONSTANTS.AGG_SIG_ME_ADDITIONAL_DATA
-    else:
-        add_data = bytes.fromhex(add_data)
     try:
-        bundle = await sign_coin_spends(
+        bundle = await asyncio.to_thread(
+            sign_coin_spends,
             coin_spends,
-            public_key_to_private_key,
+            private_keys.get,
             None,
             add_data,
             DEFAULT_CONSTANTS.MAX_BLOCK_COST_CLVM,
@@ -111,3 +105,33 @@ def generate_ssks(msk: PrivateKey, start_index: int = 0, count: int = 3) -> List
         ssk = calculate_synthetic_secret_key(sk, DEFAULT_HIDDEN_PUZZLE_HASH)
         ssks.append(ssk)
     return ssks
+
+
+def run(main: Coroutine) -> Any:
+    """Run the main coroutine on uvloop, falling back to the default asyncio loop where it's unavailable (Windows)."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    return uvloop.run(main)
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1, got %d" % number)
+    return number
+
+
+def setup_logging(level: str = "WARNING"):
+    """Log through a queue so that writing records to stderr happens in a background thread, not on the event loop."""
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, stream_handler)
+    logging.basicConfig(level=logging.WARNING, handlers=[queue_handler])
+    logging.getLogger("circuit_cli").setLevel(level.upper())
+    listener.start()
+    atexit.register(listener.stop)